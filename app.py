@@ -3,23 +3,19 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from fredapi import Fred
-import plotly.express as px
 import plotly.graph_objects as go
 import datetime
-import time
+import string
 import threading
-import pytz
+import atexit
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
 from dateutil.relativedelta import relativedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-# Try to import st_aggrid with fallback
-try:
-    from st_aggrid import AgGrid, GridOptionsBuilder
-    AGGRID_AVAILABLE = True
-except ImportError:
-    AGGRID_AVAILABLE = False
-    st.warning("streamlit-aggrid not available. Using standard DataFrame display.")
+logger = logging.getLogger(__name__)
 
 # Configuration
 st.set_page_config(
@@ -30,15 +26,86 @@ st.set_page_config(
 )
 
 # API Clients (using Streamlit secrets)
+@st.cache_resource
+def get_fred():
+    """One FRED client per server process, reused across reruns and sessions"""
+    return Fred(api_key=st.secrets["FRED_API_KEY"])
+
 try:
-    fred = Fred(api_key=st.secrets["FRED_API_KEY"])
+    fred = get_fred()
 except Exception as e:
     st.error(f"Failed to initialize FRED API: {str(e)}")
     st.stop()
 
 # Constants
-TIME_ZONE = pytz.timezone('America/New_York')
-REFRESH_INTERVAL = 60  # seconds
+TIME_ZONE = ZoneInfo('America/New_York')
+REFRESH_INTERVAL = 60  # seconds, during US regular trading hours
+EXTENDED_HOURS_INTERVAL = 5 * 60  # seconds, US pre/post-market
+OFF_HOURS_INTERVAL = 60 * 60  # seconds, overnight and weekends
+SESSION_BOUNDARIES = (4 * 60, 9 * 60 + 30, 16 * 60, 20 * 60, 24 * 60)  # minutes past midnight ET where the tier changes
+MAX_WORKERS = 8  # concurrent upstream requests per fetch
+DOWNLOAD_ATTEMPTS = 3  # tries for a batched Yahoo download before giving up
+DOWNLOAD_BACKOFF = 2  # seconds before the first retry, doubled after each failure
+FRED_CACHE_TTL = 24 * 3600  # seconds; macro series are published daily at most
+MACRO_REFRESH_INTERVAL = 60 * 60  # seconds between rebuilding the FRED-backed sections
+FRED_LOOKBACK_YEARS = 7  # covers 24 quarterly GDP prints, the longest history shown
+# Level buckets: a value above each threshold moves up one label
+VIX_THRESHOLDS = np.array([20.0, 30.0])
+VIX_LABELS = np.array(["Normal", "Elevated", "High"])
+# Indexed by np.sign(sentiment) + 1
+SENTIMENT_LABELS = np.array(["Negative", "Neutral", "Positive"])
+SENTIMENT_COLORS = np.array(["#e74a3b", "#6c757d", "#1cc88a"])
+IMPACT_COLORS = {"High": "#e74a3b", "Medium": "#f6c23e"}
+MARKET_INDICES = {
+    "S&P 500": "^GSPC",
+    "NASDAQ": "^IXIC",
+    "Dow 30": "^DJI",
+    "Russell 2000": "^RUT",
+    "FTSE 100": "^FTSE",
+    "DAX": "^GDAXI",
+    "CAC 40": "^FCHI",
+    "Nikkei 225": "^N225",
+    "Shanghai": "^SSEC",
+    "Hang Seng": "^HSI"
+}
+COMMODITIES = {
+    "Crude Oil (WTI)": {"ticker": "CL=F", "unit": "$/bbl"},
+    "Brent Crude": {"ticker": "BZ=F", "unit": "$/bbl"},
+    "Gold": {"ticker": "GC=F", "unit": "$/oz"},
+    "Silver": {"ticker": "SI=F", "unit": "$/oz"},
+    "Copper": {"ticker": "HG=F", "unit": "$/lb"},
+    "Natural Gas": {"ticker": "NG=F", "unit": "$/mmBtu"},
+    "Wheat": {"ticker": "ZW=F", "unit": "$/bushel"}
+}
+
+def _latest(series):
+    """Most recent observation"""
+    return series.iloc[-1]
+
+def _yoy_pct(series):
+    """Change over the last twelve (monthly) observations, in percent"""
+    return (series.iloc[-1] / series.iloc[-13] - 1) * 100
+
+ECONOMIC_INDICATORS = {
+    "GDP": {"series": "GDPC1", "transform": _latest, "format": "${:,.1f}B"},
+    "Inflation": {"series": "CPIAUCSL", "transform": _yoy_pct, "format": "{:.1f}%"},
+    "Unemployment": {"series": "UNRATE", "transform": _latest, "format": "{:.1f}%"},
+    "Retail Sales": {"series": "RSXFS", "transform": _yoy_pct, "format": "{:.1f}%"},
+    "Industrial Production": {"series": "INDPRO", "transform": _yoy_pct, "format": "{:.1f}%"}
+}
+CENTRAL_BANK_RATES = {
+    "Federal Reserve": {"series": "FEDFUNDS", "color": "#2e59d9"},
+    "ECB": {"series": "ECBESTRVOLWGTTRMDMNRT", "color": "#4e73df"},
+    "BOE": {"series": "IUDSOIA", "color": "#e74a3b"},
+    "BOJ": {"series": "IRSTCI01JPM156N", "color": "#1cc88a"}
+}
+# Placeholder GPR/sentiment readings (no live feed yet), drawn once at startup
+_placeholder_rng = np.random.default_rng(0)
+GPR_VALUE = float(_placeholder_rng.normal(50, 10))
+GPR_HISTORY = pd.Series(_placeholder_rng.normal(50, 5, 30))
+SENTIMENT_VALUE = float(_placeholder_rng.uniform(0, 100))
+# Indices and commodities share one batched Yahoo download
+QUOTE_TICKERS = tuple(MARKET_INDICES.values()) + tuple(config["ticker"] for config in COMMODITIES.values())
 
 # ==================== STYLING ====================
 st.markdown("""
@@ -58,6 +125,15 @@ st.markdown("""
         border-left: 4px solid #4e73df;
     }
     
+    .card-row {
+        display: flex;
+        gap: 1rem;
+    }
+    
+    .card-row .metric-card {
+        flex: 1;
+    }
+    
     .metric-title {
         font-size: 0.85rem;
         color: #5a5c69;
@@ -117,189 +193,253 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Metric card markup, compiled once and filled per card
+METRIC_CARD = string.Template(
+    '<div class="metric-card">'
+    '<div class="metric-title">$title</div>'
+    '<div class="metric-value">$value</div>'
+    '<div class="metric-change $change_class">$change</div>'
+    '</div>'
+)
+
+def render_metric(col, title, value, change, change_class=""):
+    """Emit one metric card into a column"""
+    col.markdown(METRIC_CARD.substitute(
+        title=title,
+        value=value,
+        change_class=change_class,
+        change=change
+    ), unsafe_allow_html=True)
+
+# ==================== CACHED FETCHERS ====================
+@st.cache_data(ttl=FRED_CACHE_TTL, show_spinner=False)
+def _fred_series(series_id, observation_start=None):
+    """FRED series change at most daily, so one download serves a whole day of refreshes"""
+    # Arrow-backed floats are cheaper to pickle into the cache; gaps are dropped
+    # so downstream arithmetic never meets pd.NA
+    series = fred.get_series(series_id, observation_start=observation_start)
+    return series.dropna().astype("float64[pyarrow]")
+
+@st.cache_data(ttl=REFRESH_INTERVAL, show_spinner=False)
+def _yf_history(ticker, period, interval="1d"):
+    """Single-ticker Yahoo history, cached for one refresh cycle"""
+    # Indices and futures carry no dividends/splits, so skip that processing
+    return yf.Ticker(ticker).history(period=period, interval=interval, auto_adjust=False, actions=False)
+
+def _download_quotes(tickers, period="1mo"):
+    """Download daily bars for all tickers in one batched request"""
+    return yf.download(
+        list(tickers),
+        period=period,
+        interval="1d",
+        group_by="ticker",
+        threads=True,
+        auto_adjust=False,
+        progress=False
+    )
+
 # ==================== DATA MANAGER ====================
 class DataManager:
     def __init__(self):
-        self.data_lock = threading.Lock()
         self.cache = {
             "market": None,
+            "market_closes": None,
+            "intraday": None,
             "economic": None,
             "rates": None,
             "commodities": None,
             "risk": None,
-            "news": None
+            "news": None,
+            "updated": datetime.datetime.now(TIME_ZONE)
         }
-        self.last_updated = datetime.datetime.now(TIME_ZONE)
+        self.macro_updated = None
         self.stop_event = threading.Event()
+        self.refresh_event = threading.Event()
         
-    def fetch_market_data(self):
-        """Fetch real-time market data with retries"""
-        indices = {
-            "S&P 500": "^GSPC",
-            "NASDAQ": "^IXIC",
-            "Dow 30": "^DJI",
-            "Russell 2000": "^RUT",
-            "FTSE 100": "^FTSE",
-            "DAX": "^GDAXI",
-            "CAC 40": "^FCHI",
-            "Nikkei 225": "^N225",
-            "Shanghai": "^SSEC",
-            "Hang Seng": "^HSI"
-        }
-        
-        data = []
-        for name, ticker in indices.items():
+    def fetch_quotes(self):
+        """One month of daily bars for every index and commodity, retried with backoff"""
+        delay = DOWNLOAD_BACKOFF
+        for attempt in range(DOWNLOAD_ATTEMPTS):
             try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period="2d", interval="1d")
-                
-                if not hist.empty:
-                    current = hist["Close"].iloc[-1]
-                    prev_close = hist["Close"].iloc[0]
-                    change_pct = (current - prev_close) / prev_close * 100
-                    
-                    # Get intraday data for the main chart
-                    intraday = stock.history(period="1d", interval="5m") if name == "S&P 500" else None
-                    
-                    data.append({
-                        "Index": name,
-                        "Ticker": ticker,
-                        "Price": current,
-                        "Change": current - prev_close,
-                        "Change %": change_pct,
-                        "Prev Close": prev_close,
-                        "Intraday": intraday,
-                        "Updated": datetime.datetime.now(TIME_ZONE)
-                    })
+                hist = _download_quotes(QUOTE_TICKERS)
+                # yfinance reports throttling (HTTP 429) as all-empty columns rather than raising
+                if not hist.dropna(how="all").empty:
+                    return hist
             except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
+                logger.warning("Error downloading quotes: %s", e)
+            # Unlike time.sleep, this returns as soon as stop() is called
+            if attempt < DOWNLOAD_ATTEMPTS - 1 and self.stop_event.wait(delay):
+                break
+            delay *= 2
+        logger.warning("Yahoo returned no quote data after %d attempts", attempt + 1)
+        return None
+    
+    def fetch_market_data(self, hist, now):
+        """Fetch real-time market data as one row per index"""
+        if hist is None:
+            return None
         
+        quotes = self._quote_changes(hist, MARKET_INDICES.values())
+        for name, ticker in MARKET_INDICES.items():
+            if ticker not in quotes.index:
+                logger.warning("No market data returned for %s", name)
+        
+        data = pd.DataFrame({"Index": list(MARKET_INDICES), "Ticker": list(MARKET_INDICES.values())})
+        data = data.join(quotes, on="Ticker", how="inner").reset_index(drop=True)
+        data["Updated"] = now
         return data
     
-    def fetch_economic_indicators(self):
-        """Fetch key economic indicators from FRED"""
-        indicators = {
-            "GDP": {"series": "GDPC1", "transform": lambda x: x, "format": "${:,.1f}B"},
-            "Inflation": {"series": "CPIAUCSL", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"},
-            "Unemployment": {"series": "UNRATE", "transform": lambda x: x.iloc[-1], "format": "{:.1f}%"},
-            "Retail Sales": {"series": "RSXFS", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"},
-            "Industrial Production": {"series": "INDPRO", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"}
-        }
+    def fetch_intraday(self):
+        """S&P 500 5-minute bars, prefetched so the chart never waits on Yahoo"""
+        try:
+            return _yf_history(MARKET_INDICES["S&P 500"], period="1d", interval="5m")
+        except Exception as e:
+            logger.warning("Error fetching S&P 500 intraday: %s", e)
+            return None
+    
+    def fetch_market_closes(self, hist):
+        """Daily closes for the last month, one column per index"""
+        if hist is None:
+            return None
         
-        results = {}
-        for name, config in indicators.items():
-            try:
-                series = fred.get_series(config["series"])
-                value = config["transform"](series)
-                results[name] = {
-                    "value": value,
-                    "formatted": config["format"].format(value),
-                    "history": series.tail(24),
-                    "updated": datetime.datetime.now(TIME_ZONE)
-                }
-            except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
+        closes = pd.DataFrame({
+            name: self._closes_for(hist, ticker)
+            for name, ticker in MARKET_INDICES.items()
+        })
+        return closes.dropna(axis=1, how="all")
+    
+    def _quote_changes(self, hist, tickers):
+        """Latest price and day change for every ticker of a batched download, computed column-wise"""
+        closes = hist.xs("Close", level=1, axis=1).reindex(columns=list(tickers))
+        valid = closes.notna()
+        # Exchanges keep different calendars, so locate each column's own last observation
+        is_last = valid & (valid[::-1].cumsum()[::-1] == 1)
+        current = closes.where(is_last).max()
+        prev_close = closes.mask(is_last).ffill().iloc[-1].fillna(current)
+        change = current - prev_close
         
-        return results
+        quotes = pd.DataFrame({
+            "Price": current,
+            "Change": change,
+            "Change %": change / prev_close * 100,
+            "Prev Close": prev_close
+        }).dropna(subset=["Price"])
+        return quotes
+    
+    def _closes_for(self, hist, ticker):
+        """Slice one ticker's close series out of a batched download"""
+        try:
+            return hist[ticker]["Close"].dropna()
+        except KeyError:
+            return pd.Series(dtype="float64")
     
-    def fetch_central_bank_rates(self):
-        """Fetch central bank rates with historical context"""
-        rates = {
-            "Federal Reserve": {"series": "FEDFUNDS", "color": "#2e59d9"},
-            "ECB": {"series": "ECBESTRVOLWGTTRMDMNRT", "color": "#4e73df"},
-            "BOE": {"series": "IUDSOIA", "color": "#e74a3b"},
-            "BOJ": {"series": "IRSTCI01JPM156N", "color": "#1cc88a"}
-        }
-        
-        results = {}
-        for name, config in rates.items():
-            try:
-                series = fred.get_series(config["series"])
-                current = series.iloc[-1]
-                prev = series.iloc[-2] if len(series) > 1 else current
-                change = current - prev
-                
-                results[name] = {
-                    "rate": current,
-                    "change": change,
-                    "history": series.tail(36),
-                    "color": config["color"],
-                    "updated": datetime.datetime.now(TIME_ZONE)
-                }
-            except Exception as e:
-                st.error(f"Error fetching {name} rates: {str(e)}")
+    def fetch_economic_indicators(self, now):
+        """Fetch key economic indicators from FRED"""
+        return self._fetch_concurrently(self._fetch_one_indicator, ECONOMIC_INDICATORS, now)
+    
+    def _fred_start(self, now):
+        """Earliest observation worth downloading; only the recent tail is displayed"""
+        return (now - relativedelta(years=FRED_LOOKBACK_YEARS)).date()
+    
+    def _fetch_concurrently(self, fetch_one, configs, now):
+        """Run fetch_one(name, config, now) for every entry at once, dropping failures"""
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(configs))) as ex:
+            futures = {name: ex.submit(fetch_one, name, config, now) for name, config in configs.items()}
         
-        return results
+        results = {name: future.result() for name, future in futures.items()}
+        return {name: data for name, data in results.items() if data is not None}
+    
+    def _fetch_one_indicator(self, name, config, now):
+        """Fetch and transform a single FRED indicator (runs inside the worker pool)"""
+        try:
+            series = _fred_series(config["series"], self._fred_start(now))
+            value = config["transform"](series)
+            return {
+                "value": value,
+                "formatted": config["format"].format(value),
+                "history": series.iloc[-24:],
+                "updated": now
+            }
+        except Exception as e:
+            logger.warning("Error fetching %s: %s", name, e)
+            return None
     
-    def fetch_commodities(self):
+    def fetch_central_bank_rates(self, now):
+        """Fetch central bank rates with historical context"""
+        return self._fetch_concurrently(self._fetch_one_rate, CENTRAL_BANK_RATES, now)
+    
+    def _fetch_one_rate(self, name, config, now):
+        """Fetch a single central bank rate series (runs inside the worker pool)"""
+        try:
+            series = _fred_series(config["series"], self._fred_start(now))
+            current = series.iloc[-1]
+            prev = series.iloc[-2] if len(series) > 1 else current
+            change = current - prev
+            
+            return {
+                "rate": current,
+                "change": change,
+                "history": series.iloc[-36:],
+                "color": config["color"],
+                "updated": now
+            }
+        except Exception as e:
+            logger.warning("Error fetching %s rates: %s", name, e)
+            return None
+    
+    def fetch_commodities(self, hist, now):
         """Fetch real-time commodities data"""
-        commodities = {
-            "Crude Oil (WTI)": {"ticker": "CL=F", "unit": "$/bbl"},
-            "Brent Crude": {"ticker": "BZ=F", "unit": "$/bbl"},
-            "Gold": {"ticker": "GC=F", "unit": "$/oz"},
-            "Silver": {"ticker": "SI=F", "unit": "$/oz"},
-            "Copper": {"ticker": "HG=F", "unit": "$/lb"},
-            "Natural Gas": {"ticker": "NG=F", "unit": "$/mmBtu"},
-            "Wheat": {"ticker": "ZW=F", "unit": "$/bushel"}
-        }
+        if hist is None:
+            return None
         
-        results = []
-        for name, config in commodities.items():
-            try:
-                ticker = yf.Ticker(config["ticker"])
-                hist = ticker.history(period="2d", interval="1d")
-                
-                if not hist.empty:
-                    current = hist["Close"].iloc[-1]
-                    prev_close = hist["Close"].iloc[0]
-                    change_pct = (current - prev_close) / prev_close * 100
-                    
-                    results.append({
-                        "Commodity": name,
-                        "Price": current,
-                        "Unit": config["unit"],
-                        "Change %": change_pct,
-                        "Updated": datetime.datetime.now(TIME_ZONE)
-                    })
-            except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
+        tickers = [config["ticker"] for config in COMMODITIES.values()]
+        quotes = self._quote_changes(hist, tickers)
+        for name, ticker in zip(COMMODITIES, tickers):
+            if ticker not in quotes.index:
+                logger.warning("No commodity data returned for %s", name)
         
-        return results
-    
-    def fetch_risk_sentiment(self):
+        # Built once per refresh in display order, so the render just hands it to st.dataframe
+        data = pd.DataFrame({
+            "Commodity": list(COMMODITIES),
+            "Ticker": tickers,
+            "Unit": [config["unit"] for config in COMMODITIES.values()]
+        })
+        data = data.join(quotes[["Price", "Change %"]], on="Ticker", how="inner")
+        data["Updated"] = now
+        return data[["Commodity", "Price", "Unit", "Change %", "Updated"]].reset_index(drop=True)
+    
+    def fetch_risk_sentiment(self, now):
         """Fetch risk and sentiment indicators"""
-        now = datetime.datetime.now(TIME_ZONE)
-        
         try:
-            vix = yf.Ticker("^VIX").history(period="1d").iloc[0]["Close"]
+            vix_history = _yf_history("^VIX", period="1mo")["Close"]
+            vix = vix_history.iloc[-1]
         except Exception as e:
-            st.error(f"Error fetching VIX: {str(e)}")
+            logger.warning("Error fetching VIX: %s", e)
             vix = 20  # Default value
+            vix_history = pd.Series(dtype="float64")
             
         return {
             "VIX": {
                 "value": vix,
-                "level": "High" if vix > 30 else "Elevated" if vix > 20 else "Normal",
-                "history": yf.Ticker("^VIX").history(period="1mo")["Close"],
+                "level": str(VIX_LABELS[np.searchsorted(VIX_THRESHOLDS, vix)]),
+                "history": vix_history,
                 "updated": now
             },
             "GPR": {
-                "value": np.random.normal(50, 10),
+                "value": GPR_VALUE,
                 "level": "Elevated",
-                "history": pd.Series(np.random.normal(50, 5, 30)),
+                "history": GPR_HISTORY,
                 "updated": now
             },
             "Sentiment": {
-                "value": np.random.uniform(0, 100),
+                "value": SENTIMENT_VALUE,
                 "level": "Neutral",
                 "updated": now
             }
         }
     
-    def fetch_news(self):
+    def fetch_news(self, now):
         """Fetch relevant economic news"""
-        now = datetime.datetime.now(TIME_ZONE)
-        
         return [
             {
                 "headline": "Fed Holds Rates Steady, Signals Potential Cuts Later This Year",
@@ -319,29 +459,84 @@ class DataManager:
     
     def update_all_data(self):
         """Update all data sources"""
+        # One timestamp per cycle, shared by every record
+        now = datetime.datetime.now(TIME_ZONE)
+        # FRED-backed sections move at most daily, so they run on a slower clock
+        macro_due = (self.macro_updated is None
+                     or (now - self.macro_updated).total_seconds() >= MACRO_REFRESH_INTERVAL)
+        # The quote sections all wait on one batched download (retries included),
+        # submitted below as `quotes` alongside them
+        sections = {
+            "market": lambda: self.fetch_market_data(quotes.result(), now),
+            "market_closes": lambda: self.fetch_market_closes(quotes.result()),
+            "intraday": self.fetch_intraday,
+            "commodities": lambda: self.fetch_commodities(quotes.result(), now),
+            "risk": lambda: self.fetch_risk_sentiment(now),
+            "news": lambda: self.fetch_news(now)
+        }
+        if macro_due:
+            sections["economic"] = lambda: self.fetch_economic_indicators(now)
+            sections["rates"] = lambda: self.fetch_central_bank_rates(now)
         try:
-            new_data = {
-                "market": self.fetch_market_data(),
-                "economic": self.fetch_economic_indicators(),
-                "rates": self.fetch_central_bank_rates(),
-                "commodities": self.fetch_commodities(),
-                "risk": self.fetch_risk_sentiment(),
-                "news": self.fetch_news()
-            }
+            # Sections hit different backends, so fetch them side by side; the
+            # extra worker runs the download so waiting sections can't starve it
+            with ThreadPoolExecutor(max_workers=len(sections) + 1) as ex:
+                quotes = ex.submit(self.fetch_quotes)
+                futures = {key: ex.submit(fetch) for key, fetch in sections.items()}
+            # A failed section returns None; skipping it keeps its last good value
+            new_data = {key: future.result() for key, future in futures.items()}
+            new_data = {key: data for key, data in new_data.items() if data is not None}
+            
+            macro_complete = False
+            if macro_due:
+                # Series FRED failed to return keep their previous reading
+                macro_complete = (len(new_data["economic"]) == len(ECONOMIC_INDICATORS)
+                                  and len(new_data["rates"]) == len(CENTRAL_BANK_RATES))
+                for key in ("economic", "rates"):
+                    new_data[key] = {**(self.cache[key] or {}), **new_data[key]}
+            
+            # The timestamp only advances when fresh quotes actually arrived
+            if quotes.result() is not None:
+                new_data["updated"] = now
+            
+            # Readers never see a half-built cache: the new dict (carrying over
+            # any sections skipped or failed this cycle) is published with a
+            # single reference assignment, so no lock is needed
+            self.cache = {**self.cache, **new_data}
+            # Retry missing series next cycle rather than after MACRO_REFRESH_INTERVAL
+            if macro_complete:
+                self.macro_updated = now
             
-            with self.data_lock:
-                self.cache = new_data
-                self.last_updated = datetime.datetime.now(TIME_ZONE)
-                
         except Exception as e:
-            st.error(f"Data update failed: {str(e)}")
+            logger.error("Data update failed: %s", e)
+    
+    def next_refresh_delay(self, now):
+        """Seconds until the next scheduled refresh, based on US market hours"""
+        # Never sleep past the next tier boundary, so a faster cadence starts on time
+        seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        to_boundary = min(b * 60 for b in SESSION_BOUNDARIES if b * 60 > seconds) - seconds
+        return min(self._tier_interval(now), to_boundary)
+    
+    def _tier_interval(self, now):
+        """Refresh interval for the trading session now falls in"""
+        if now.weekday() >= 5:
+            return OFF_HOURS_INTERVAL
+        
+        minutes = now.hour * 60 + now.minute
+        if 9 * 60 + 30 <= minutes < 16 * 60:
+            return REFRESH_INTERVAL
+        if 4 * 60 <= minutes < 20 * 60:
+            return EXTENDED_HOURS_INTERVAL
+        return OFF_HOURS_INTERVAL
     
     def start(self):
         """Start the data update thread"""
         def update_loop():
             while not self.stop_event.is_set():
                 self.update_all_data()
-                time.sleep(REFRESH_INTERVAL)
+                # Wake early on a manual refresh or stop; repeated clicks coalesce
+                self.refresh_event.wait(self.next_refresh_delay(datetime.datetime.now(TIME_ZONE)))
+                self.refresh_event.clear()
         
         self.thread = threading.Thread(target=update_loop, daemon=True)
         self.thread.start()
@@ -349,15 +544,178 @@ class DataManager:
     def stop(self):
         """Stop the data update thread"""
         self.stop_event.set()
+        self.refresh_event.set()
         self.thread.join()
 
-# Initialize data manager
-if 'data_manager' not in st.session_state:
+# Initialize data manager (one per server process, shared by all sessions)
+@st.cache_resource
+def get_data_manager():
     data_manager = DataManager()
     data_manager.start()
-    st.session_state.data_manager = data_manager
-else:
-    data_manager = st.session_state.data_manager
+    atexit.register(data_manager.stop)
+    return data_manager
+
+data_manager = get_data_manager()
+# Read the cache reference once so every section renders the same refresh
+snapshot = data_manager.cache
+
+# ==================== CHART BUILDERS ====================
+def _series_key(series):
+    """Cheap identity for a history series: a new observation changes it"""
+    if series.empty:
+        return (0,)
+    return (len(series), series.index[-1], float(series.iloc[-1]))
+
+# Keyed by the bars, which change every cycle, so keep only the current and previous figure
+@st.cache_data(ttl=3600, max_entries=2, show_spinner=False)
+def _intraday_figure(intraday):
+    """S&P 500 intraday chart, rebuilt only when new bars arrive"""
+    fig = go.Figure()
+    if not intraday.empty:
+        fig.add_trace(go.Scatter(
+            x=intraday.index,
+            y=intraday["Close"],
+            name="S&P 500",
+            line=dict(color='#4e73df', width=2)
+        ))
+    
+    fig.update_layout(
+        title="S&P 500 Intraday",
+        xaxis_title="Time",
+        yaxis_title="Price",
+        hovermode="x unified",
+        height=400
+    )
+    return fig
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.Series: _series_key})
+def _economic_figure(histories):
+    """Economic indicators trend chart, rebuilt only when a series changes"""
+    fig = go.Figure()
+    for name, history in histories.items():
+        fig.add_trace(go.Scatter(
+            x=history.index,
+            y=history,
+            name=name,
+            mode="lines"
+        ))
+    
+    fig.update_layout(
+        title="Economic Indicators Trend",
+        xaxis_title="Date",
+        yaxis_title="Value",
+        hovermode="x unified",
+        height=400
+    )
+    return fig
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.Series: _series_key})
+def _rates_figure(histories, colors):
+    """Central bank rates history chart"""
+    fig = go.Figure()
+    for name, history in histories.items():
+        fig.add_trace(go.Scatter(
+            x=history.index,
+            y=history,
+            name=name,
+            line=dict(color=colors[name], width=2),
+            mode="lines"
+        ))
+    
+    fig.update_layout(
+        title="Central Bank Rates History",
+        xaxis_title="Date",
+        yaxis_title="Rate (%)",
+        hovermode="x unified",
+        height=400
+    )
+    return fig
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.Series: _series_key})
+def _vix_figure(history):
+    """VIX one-month history chart"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=history.index,
+        y=history,
+        name="VIX Index",
+        line=dict(color='#e74a3b', width=2)
+    ))
+    
+    fig.update_layout(
+        title="VIX Index (30 Days)",
+        xaxis_title="Date",
+        yaxis_title="Value",
+        hovermode="x unified",
+        height=400
+    )
+    return fig
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def _market_overview():
+    """Market cards and detail view; reruns on its own every refresh interval and on view switches"""
+    # Read the cache reference once so the timestamp, cards and views show the same refresh
+    cache = data_manager.cache
+    st.markdown(f"**Last Updated:** <span class='blink'>{cache['updated'].strftime('%Y-%m-%d %H:%M:%S')}</span>", 
+                unsafe_allow_html=True)
+    market_data = cache["market"]
+    if market_data is None or market_data.empty:
+        return
+    
+    # Top indices performance, emitted as one flex row instead of four columns
+    cards = []
+    for index in market_data.head(4).to_dict("records"):
+        change_class = "positive" if index["Change %"] >= 0 else "negative"
+        change_arrow = "▲" if index["Change %"] >= 0 else "▼"
+        
+        cards.append(METRIC_CARD.substitute(
+            title=index["Index"],
+            value=f"{index['Price']:,.2f}",
+            change_class=change_class,
+            change=f"{change_arrow} {abs(index['Change %']):.2f}%"
+        ))
+    st.markdown(f'<div class="card-row">{"".join(cards)}</div>', unsafe_allow_html=True)
+    
+    # Market detail view (only the selected view is built on each rerun)
+    closes_df = cache["market_closes"]
+    market_view = st.radio(
+        "View",
+        ["Charts", "Performance Table", "Correlation Matrix"],
+        horizontal=True,
+        key="mkt_view",
+        label_visibility="collapsed"
+    )
+    
+    if market_view == "Charts":
+        # Main index chart, drawn from bars the update thread already fetched
+        intraday = cache["intraday"]
+        if intraday is not None:
+            st.plotly_chart(_intraday_figure(intraday), use_container_width=True)
+        else:
+            st.info("S&P 500 intraday data is not available yet.")
+    
+    elif market_view == "Performance Table":
+        # Performance table (small enough for the native grid)
+        st.dataframe(
+            market_data[["Index", "Price", "Change", "Change %", "Updated"]],
+            column_config={
+                "Price": st.column_config.NumberColumn(format="%.2f"),
+                "Change": st.column_config.NumberColumn(format="%.2f"),
+                "Change %": st.column_config.NumberColumn(format="%.2f%%"),
+                "Updated": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+            },
+            hide_index=True,
+            use_container_width=True,
+            height=400
+        )
+    
+    elif closes_df is not None and closes_df.shape[1] > 1:
+        # Indices trade on different calendars; carry prices over local holidays
+        corr_matrix = closes_df.ffill().pct_change().corr()
+        st.dataframe(corr_matrix.style.format("{:.2f}"), height=400)
+    
+    else:
+        st.info("Not enough price history to compute correlations.")
 
 # ==================== SIDEBAR ====================
 with st.sidebar:
@@ -380,12 +738,13 @@ with st.sidebar:
     
     # Data refresh
     st.markdown("---")
-    st.markdown(f"**Last Updated:** <span class='blink'>{data_manager.last_updated.strftime('%Y-%m-%d %H:%M:%S')}</span>", 
-                unsafe_allow_html=True)
-    
     if st.button("🔄 Manual Refresh"):
-        data_manager.update_all_data()
-        st.rerun()
+        # Drop memoized history so the forced cycle really goes back to Yahoo;
+        # FRED series are left cached since they change at most daily
+        _yf_history.clear()
+        # Serviced by the update thread so the page doesn't block on the fetch
+        data_manager.refresh_event.set()
+        st.caption("Refresh requested, new data will appear on the next rerun.")
     
     st.markdown("---")
     st.markdown("### About")
@@ -393,7 +752,7 @@ with st.sidebar:
     **Global Macro Pro Dashboard**  
     Professional-grade macroeconomic monitoring tool  
     Version 2.1.0  
-    Data updates every 60 seconds  
+    Data updates every 60 seconds during US market hours  
     """)
 
 # ==================== MAIN DASHBOARD ====================
@@ -410,281 +769,91 @@ st.markdown(f"""
 # ===== MARKET OVERVIEW =====
 st.markdown('<div class="section-header">📈 Market Overview</div>', unsafe_allow_html=True)
 
-if data_manager.cache["market"]:
-    market_data = data_manager.cache["market"]
-    
-    # Top indices performance
-    cols = st.columns(4)
-    for i, index in enumerate(market_data[:4]):
-        with cols[i]:
-            change_class = "positive" if index["Change %"] >= 0 else "negative"
-            change_arrow = "▲" if index["Change %"] >= 0 else "▼"
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">{index['Index']}</div>
-                <div class="metric-value">{index['Price']:,.2f}</div>
-                <div class="metric-change {change_class}">
-                    {change_arrow} {abs(index['Change %']):.2f}%
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # Market detail view
-    tab1, tab2 = st.tabs(["Charts", "Performance Table"])
-    
-    with tab1:
-        # Main index chart
-        fig = go.Figure()
-        
-        if market_data[0]["Intraday"] is not None:
-            intraday = market_data[0]["Intraday"]
-            fig.add_trace(go.Scatter(
-                x=intraday.index,
-                y=intraday["Close"],
-                name="S&P 500",
-                line=dict(color='#4e73df', width=2)
-            ))
-        
-        fig.update_layout(
-            title="S&P 500 Intraday",
-            xaxis_title="Time",
-            yaxis_title="Price",
-            hovermode="x unified",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with tab2:
-        # Performance table with fallback for st_aggrid
-        df_market = pd.DataFrame(market_data)
-        df_market = df_market[["Index", "Price", "Change", "Change %", "Updated"]]
-        
-        # Convert datetime columns to strings
-        if 'Updated' in df_market.columns:
-            df_market['Updated'] = df_market['Updated'].astype(str)
-        
-        if AGGRID_AVAILABLE:
-            try:
-                gb = GridOptionsBuilder.from_dataframe(df_market)
-                gb.configure_default_column(
-                    filterable=True,
-                    sortable=True,
-                    resizable=True,
-                    editable=False,
-                    wrapText=True,
-                    autoHeight=True
-                )
-                gb.configure_column("Change %", 
-                                  cellStyle=lambda v: {"color": "green" if v >= 0 else "red"})
-                
-                gridOptions = gb.build()
-                
-                AgGrid(
-                    df_market,
-                    gridOptions=gridOptions,
-                    height=400,
-                    theme='streamlit',
-                    fit_columns_on_grid_load=True,
-                    allow_unsafe_jscode=True
-                )
-            except Exception as e:
-                st.error(f"Error displaying AgGrid table: {str(e)}")
-                st.dataframe(df_market.style.format({
-                    "Price": "{:,.2f}",
-                    "Change": "{:,.2f}",
-                    "Change %": "{:,.2f}%"
-                }), height=400)
-        else:
-            st.dataframe(df_market.style.format({
-                "Price": "{:,.2f}",
-                "Change": "{:,.2f}",
-                "Change %": "{:,.2f}%"
-            }), height=400)
+_market_overview()
 
 # ===== ECONOMIC INDICATORS =====
 st.markdown('<div class="section-header">📊 Economic Indicators</div>', unsafe_allow_html=True)
 
-if data_manager.cache["economic"]:
-    economic_data = data_manager.cache["economic"]
+if snapshot["economic"]:
+    economic_data = snapshot["economic"]
     
     cols = st.columns(5)
-    for i, (name, data) in enumerate(economic_data.items()):
-        with cols[i]:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">{name}</div>
-                <div class="metric-value">{data['formatted']}</div>
-                <div class="metric-change">Latest reading</div>
-            </div>
-            """, unsafe_allow_html=True)
+    for col, (name, data) in zip(cols, economic_data.items()):
+        render_metric(col, name, data["formatted"], "Latest reading")
     
     # Economic indicators chart
-    fig = go.Figure()
-    for name, data in economic_data.items():
-        fig.add_trace(go.Scatter(
-            x=data["history"].index,
-            y=data["history"],
-            name=name,
-            mode="lines"
-        ))
-    
-    fig.update_layout(
-        title="Economic Indicators Trend",
-        xaxis_title="Date",
-        yaxis_title="Value",
-        hovermode="x unified",
-        height=400
-    )
+    fig = _economic_figure({name: data["history"] for name, data in economic_data.items()})
     st.plotly_chart(fig, use_container_width=True)
 
 # ===== CENTRAL BANK RATES =====
 st.markdown('<div class="section-header">🏦 Central Bank Rates</div>', unsafe_allow_html=True)
 
-if data_manager.cache["rates"]:
-    rates_data = data_manager.cache["rates"]
+if snapshot["rates"]:
+    rates_data = snapshot["rates"]
     
     cols = st.columns(4)
-    for i, (name, data) in enumerate(rates_data.items()):
-        with cols[i]:
-            change_class = "positive" if data["change"] <= 0 else "negative"  # Lower rates are positive
-            change_arrow = "▼" if data["change"] <= 0 else "▲"
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">{name}</div>
-                <div class="metric-value">{data['rate']:.2f}%</div>
-                <div class="metric-change {change_class}">
-                    {change_arrow} {abs(data['change']):.2f}bps
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    for col, (name, data) in zip(cols, rates_data.items()):
+        change_class = "positive" if data["change"] <= 0 else "negative"  # Lower rates are positive
+        change_arrow = "▼" if data["change"] <= 0 else "▲"
+        
+        render_metric(
+            col,
+            name,
+            f"{data['rate']:.2f}%",
+            f"{change_arrow} {abs(data['change']):.2f}bps",
+            change_class
+        )
     
     # Rates history chart
-    fig = go.Figure()
-    for name, data in rates_data.items():
-        fig.add_trace(go.Scatter(
-            x=data["history"].index,
-            y=data["history"],
-            name=name,
-            line=dict(color=data["color"], width=2),
-            mode="lines"
-        ))
-    
-    fig.update_layout(
-        title="Central Bank Rates History",
-        xaxis_title="Date",
-        yaxis_title="Rate (%)",
-        hovermode="x unified",
-        height=400
+    fig = _rates_figure(
+        {name: data["history"] for name, data in rates_data.items()},
+        {name: data["color"] for name, data in rates_data.items()}
     )
     st.plotly_chart(fig, use_container_width=True)
 
 # ===== COMMODITIES =====
 st.markdown('<div class="section-header">⛏️ Commodities</div>', unsafe_allow_html=True)
 
-if data_manager.cache["commodities"]:
-    commodities_data = data_manager.cache["commodities"]
-    df_commodities = pd.DataFrame(commodities_data)
-    
-    # Convert datetime columns to strings
-    if 'Updated' in df_commodities.columns:
-        df_commodities['Updated'] = df_commodities['Updated'].astype(str)
-    
-    if AGGRID_AVAILABLE:
-        try:
-            gb = GridOptionsBuilder.from_dataframe(df_commodities)
-            gb.configure_default_column(
-                filterable=True,
-                sortable=True,
-                resizable=True,
-                editable=False
-            )
-            gb.configure_column("Change %", 
-                              cellStyle=lambda v: {"color": "green" if v >= 0 else "red"})
-            
-            AgGrid(
-                df_commodities,
-                gridOptions=gb.build(),
-                height=300,
-                theme="streamlit",
-                fit_columns_on_grid_load=True,
-                allow_unsafe_jscode=True
-            )
-        except Exception as e:
-            st.error(f"Error displaying AgGrid table: {str(e)}")
-            st.dataframe(df_commodities.style.format({
-                "Price": "{:,.2f}",
-                "Change %": "{:,.2f}%"
-            }), height=300)
-    else:
-        st.dataframe(df_commodities.style.format({
-            "Price": "{:,.2f}",
-            "Change %": "{:,.2f}%"
-        }), height=300)
+df_commodities = snapshot["commodities"]
+if df_commodities is not None and not df_commodities.empty:
+    st.dataframe(
+        df_commodities,
+        column_config={
+            "Price": st.column_config.NumberColumn(format="%.2f"),
+            "Change %": st.column_config.NumberColumn(format="%.2f%%"),
+            "Updated": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+        },
+        hide_index=True,
+        use_container_width=True,
+        height=300
+    )
 
 # ===== RISK & SENTIMENT =====
 st.markdown('<div class="section-header">⚠️ Risk & Sentiment</div>', unsafe_allow_html=True)
 
-if data_manager.cache["risk"]:
-    risk_data = data_manager.cache["risk"]
+if snapshot["risk"]:
+    risk_data = snapshot["risk"]
     
     cols = st.columns(3)
-    with cols[0]:
-        vix_level = risk_data["VIX"]["level"]
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-title">VIX Index</div>
-            <div class="metric-value">{risk_data['VIX']['value']:.2f}</div>
-            <div class="metric-change">Level: {vix_level}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[1]:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-title">Geopolitical Risk</div>
-            <div class="metric-value">{risk_data['GPR']['value']:.1f}</div>
-            <div class="metric-change">Level: {risk_data['GPR']['level']}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[2]:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-title">Market Sentiment</div>
-            <div class="metric-value">{risk_data['Sentiment']['value']:.1f}</div>
-            <div class="metric-change">Level: {risk_data['Sentiment']['level']}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    render_metric(cols[0], "VIX Index", f"{risk_data['VIX']['value']:.2f}", f"Level: {risk_data['VIX']['level']}")
+    render_metric(cols[1], "Geopolitical Risk", f"{risk_data['GPR']['value']:.1f}", f"Level: {risk_data['GPR']['level']}")
+    render_metric(cols[2], "Market Sentiment", f"{risk_data['Sentiment']['value']:.1f}", f"Level: {risk_data['Sentiment']['level']}")
     
     # VIX history chart
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=risk_data["VIX"]["history"].index,
-        y=risk_data["VIX"]["history"],
-        name="VIX Index",
-        line=dict(color='#e74a3b', width=2)
-    ))
-    
-    fig.update_layout(
-        title="VIX Index (30 Days)",
-        xaxis_title="Date",
-        yaxis_title="Value",
-        hovermode="x unified",
-        height=400
-    )
+    fig = _vix_figure(risk_data["VIX"]["history"])
     st.plotly_chart(fig, use_container_width=True)
 
 # ===== NEWS & EVENTS =====
 st.markdown('<div class="section-header">📰 News & Events</div>', unsafe_allow_html=True)
 
-if data_manager.cache["news"]:
-    news_data = data_manager.cache["news"]
+if snapshot["news"]:
+    news_data = snapshot["news"]
+    
+    sentiment_buckets = np.sign([news["sentiment"] for news in news_data]).astype(int) + 1
     
-    for news in news_data:
-        sentiment_color = "#1cc88a" if news["sentiment"] > 0 else "#e74a3b" if news["sentiment"] < 0 else "#6c757d"
-        impact_color = "#e74a3b" if news["impact"] == "High" else "#f6c23e" if news["impact"] == "Medium" else "#1cc88a"
+    for news, bucket in zip(news_data, sentiment_buckets):
+        sentiment_color = SENTIMENT_COLORS[bucket]
+        impact_color = IMPACT_COLORS.get(news["impact"], "#1cc88a")
         
         st.markdown(f"""
         <div class="metric-card" style="margin-bottom: 1rem;">
@@ -697,7 +866,7 @@ if data_manager.cache["news"]:
                     {news['impact']}
                 </span>
                 <span style="font-size: 0.8rem; background: {sentiment_color}; color: white; padding: 0.2rem 0.5rem; border-radius: 10px;">
-                    Sentiment: {'Positive' if news['sentiment'] > 0 else 'Negative' if news['sentiment'] < 0 else 'Neutral'}
+                    Sentiment: {SENTIMENT_LABELS[bucket]}
                 </span>
             </div>
         </div>
@@ -707,7 +876,7 @@ if data_manager.cache["news"]:
 st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #6c757d; font-size: 0.8rem;">
-    <p>Global Macro Pro Dashboard v2.1 | Data updates every 60 seconds | © 2023 Macro Analytics</p>
+    <p>Global Macro Pro Dashboard v2.1 | Data updates every 60 seconds during US market hours | © 2023 Macro Analytics</p>
     <p>Disclaimer: This is a simulation for demonstration purposes. Not financial advice.</p>
 </div>
 """, unsafe_allow_html=True)
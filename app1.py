@@ -5,19 +5,16 @@ import yfinance as yf
 from fredapi import Fred
 import plotly.graph_objects as go
 import datetime
-import time
+import string
 import threading
-import pytz
+import atexit
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
 import warnings
 warnings.filterwarnings('ignore')
 
-# Try to import st_aggrid with fallback
-try:
-    from st_aggrid import AgGrid, GridOptionsBuilder
-    AGGRID_AVAILABLE = True
-except ImportError:
-    AGGRID_AVAILABLE = False
-    st.warning("streamlit-aggrid not available. Using standard DataFrame display.")
+logger = logging.getLogger(__name__)
 
 # Configuration
 st.set_page_config(
@@ -28,15 +25,50 @@ st.set_page_config(
 )
 
 # API Clients (using Streamlit secrets)
+@st.cache_resource
+def get_fred():
+    """One FRED client per server process, reused across reruns and sessions"""
+    return Fred(api_key=st.secrets["FRED_API_KEY"])
+
 try:
-    fred = Fred(api_key=st.secrets["FRED_API_KEY"])
+    fred = get_fred()
 except Exception as e:
     st.error(f"Failed to initialize FRED API: {str(e)}")
     st.stop()
 
 # Constants
-TIME_ZONE = pytz.timezone('America/New_York')
-REFRESH_INTERVAL = 60  # seconds
+TIME_ZONE = ZoneInfo('America/New_York')
+REFRESH_INTERVAL = 60  # seconds, during US regular trading hours
+EXTENDED_HOURS_INTERVAL = 5 * 60  # seconds, US pre/post-market
+OFF_HOURS_INTERVAL = 60 * 60  # seconds, overnight and weekends
+SESSION_BOUNDARIES = (4 * 60, 9 * 60 + 30, 16 * 60, 20 * 60, 24 * 60)  # minutes past midnight ET where the tier changes
+FRED_CACHE_TTL = 3600  # seconds; FRED series are monthly or quarterly
+MARKET_INDICES = {
+    "S&P 500": "^GSPC",
+    "NASDAQ": "^IXIC",
+    "Dow 30": "^DJI",
+    "Russell 2000": "^RUT",
+    "FTSE 100": "^FTSE",
+    "DAX": "^GDAXI",
+    "CAC 40": "^FCHI",
+    "Nikkei 225": "^N225",
+    "Shanghai": "^SSEC",
+    "Hang Seng": "^HSI"
+}
+COMMODITIES = {
+    "Crude Oil (WTI)": {"ticker": "CL=F", "unit": "$/bbl"},
+    "Brent Crude": {"ticker": "BZ=F", "unit": "$/bbl"},
+    "Gold": {"ticker": "GC=F", "unit": "$/oz"},
+    "Silver": {"ticker": "SI=F", "unit": "$/oz"},
+    "Copper": {"ticker": "HG=F", "unit": "$/lb"},
+    "Natural Gas": {"ticker": "NG=F", "unit": "$/mmBtu"},
+    "Wheat": {"ticker": "ZW=F", "unit": "$/bushel"}
+}
+# Placeholder GPR/sentiment readings (no live feed yet), drawn once at startup
+_placeholder_rng = np.random.default_rng(0)
+GPR_VALUE = float(_placeholder_rng.normal(50, 10))
+GPR_HISTORY = pd.Series(_placeholder_rng.normal(50, 5, 30))
+SENTIMENT_VALUE = float(_placeholder_rng.uniform(0, 100))
 
 st.markdown("""
 <style>
@@ -49,6 +81,8 @@ st.markdown("""
         box-shadow: 0 4px 6px rgba(0,0,0,0.05);
         border-left: 4px solid #4e73df;
     }
+    .card-row { display: flex; gap: 1rem; }
+    .card-row .metric-card { flex: 1; }
     .metric-title { font-size: 0.85rem; color: #5a5c69; text-transform: uppercase; font-weight: 700; margin-bottom: 0.25rem; }
     .metric-value { font-size: 1.5rem; font-weight: 700; color: #2e59d9; }
     .metric-change { font-size: 0.85rem; margin-top: 0.25rem; }
@@ -62,11 +96,43 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Metric card markup, compiled once and filled per card
+METRIC_CARD = string.Template(
+    '<div class="metric-card">'
+    '<div class="metric-title">$title</div>'
+    '<div class="metric-value">$value</div>'
+    '<div class="metric-change $change_class">$change</div>'
+    '</div>'
+)
+
+@st.cache_data(ttl=FRED_CACHE_TTL, show_spinner=False)
+def _fred_series(series_id):
+    """FRED series update monthly at most, so refreshes within the hour reuse the download"""
+    return fred.get_series(series_id)
+
+def _fetch_quotes(tickers, period="2d"):
+    """Daily bars for every ticker in one batched request, grouped by ticker"""
+    return yf.download(
+        list(tickers),
+        period=period,
+        interval="1d",
+        group_by="ticker",
+        threads=True,
+        progress=False,
+        auto_adjust=False
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _close_history(ticker, period):
+    """Revisiting a selection reuses the download instead of hitting Yahoo again"""
+    return yf.Ticker(ticker).history(period=period, interval="1d")["Close"]
+
 class DataManager:
     def __init__(self):
         self.data_lock = threading.Lock()
         self.cache = {
             "market": None,
+            "intraday": None,
             "economic": None,
             "rates": None,
             "commodities": None,
@@ -75,157 +141,163 @@ class DataManager:
         }
         self.last_updated = datetime.datetime.now(TIME_ZONE)
         self.stop_event = threading.Event()
+        self.refresh_event = threading.Event()
         
-    def fetch_market_data(self):
-        indices = {
-            "S&P 500": "^GSPC",
-            "NASDAQ": "^IXIC",
-            "Dow 30": "^DJI",
-            "Russell 2000": "^RUT",
-            "FTSE 100": "^FTSE",
-            "DAX": "^GDAXI",
-            "CAC 40": "^FCHI",
-            "Nikkei 225": "^N225",
-            "Shanghai": "^SSEC",
-            "Hang Seng": "^HSI"
-        }
-        data = []
-        for name, ticker in indices.items():
+    def fetch_market_data(self, now):
+        try:
+            hist = _fetch_quotes(MARKET_INDICES.values())
+        except Exception as e:
+            logger.warning("Error fetching market data: %s", e)
+            return None
+        # Collect columns rather than row dicts; the arithmetic then runs once per column
+        names, tickers, prices, prev_closes = [], [], [], []
+        for name, ticker in MARKET_INDICES.items():
             try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period="2d", interval="1d")
-                if not hist.empty:
-                    current = hist["Close"].iloc[-1]
-                    prev_close = hist["Close"].iloc[0]
-                    change_pct = (current - prev_close) / prev_close * 100
-                    intraday = stock.history(period="1d", interval="5m") if name == "S&P 500" else None
-                    data.append({
-                        "Index": name,
-                        "Ticker": ticker,
-                        "Price": current,
-                        "Change": current - prev_close,
-                        "Change %": change_pct,
-                        "Prev Close": prev_close,
-                        "Intraday": intraday,
-                        "Updated": datetime.datetime.now(TIME_ZONE)
-                    })
+                close = hist[ticker]["Close"].dropna()
+                if not close.empty:
+                    names.append(name)
+                    tickers.append(ticker)
+                    prices.append(close.iloc[-1])
+                    prev_closes.append(close.iloc[0])
             except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
-        return data
+                logger.warning("Error fetching %s: %s", name, e)
+        price = np.asarray(prices, dtype=np.float64)
+        prev_close = np.asarray(prev_closes, dtype=np.float64)
+        # Built once per refresh so reruns render it without conversion
+        return pd.DataFrame({
+            "Index": names,
+            "Ticker": tickers,
+            "Price": price,
+            "Change": price - prev_close,
+            "Change %": (price - prev_close) / prev_close * 100,
+            "Prev Close": prev_close,
+            "Updated": now
+        })
+    
+    def fetch_intraday(self):
+        """S&P 500 5-minute bars, prefetched so the chart never waits on Yahoo"""
+        try:
+            return yf.Ticker(MARKET_INDICES["S&P 500"]).history(period="1d", interval="5m")
+        except Exception as e:
+            logger.warning("Error fetching S&P 500 intraday: %s", e)
+            return None
     
-    def fetch_economic_indicators(self):
+    def fetch_economic_indicators(self, now):
         indicators = {
             "GDP": {"series": "GDPC1", "transform": lambda x: x, "format": "${:,.1f}B"},
-            "Inflation": {"series": "CPIAUCSL", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"},
+            "Inflation": {"series": "CPIAUCSL", "transform": lambda x: (x.iloc[-1] / x.iloc[-13] - 1)*100, "format": "{:.1f}%"},
             "Unemployment": {"series": "UNRATE", "transform": lambda x: x.iloc[-1], "format": "{:.1f}%"},
-            "Retail Sales": {"series": "RSXFS", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"},
-            "Industrial Production": {"series": "INDPRO", "transform": lambda x: x.pct_change(12).iloc[-1]*100, "format": "{:.1f}%"}
+            "Retail Sales": {"series": "RSXFS", "transform": lambda x: (x.iloc[-1] / x.iloc[-13] - 1)*100, "format": "{:.1f}%"},
+            "Industrial Production": {"series": "INDPRO", "transform": lambda x: (x.iloc[-1] / x.iloc[-13] - 1)*100, "format": "{:.1f}%"}
         }
-        results = {}
-        for name, config in indicators.items():
-            try:
-                series = fred.get_series(config["series"])
-                if name == "GDP":
-                    latest_val = config["transform"](series).iloc[-1] / 1e3  # Convert millions to billions
-                    formatted_val = config["format"].format(latest_val)
-                    value = latest_val
-                else:
-                    value = config["transform"](series)
-                    formatted_val = config["format"].format(value)
-                results[name] = {
-                    "value": value,
-                    "formatted": formatted_val,
-                    "history": series.tail(24),
-                    "updated": datetime.datetime.now(TIME_ZONE)
-                }
-            except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
-        return results
+        return self._fetch_concurrently(self._fetch_one_indicator, indicators, now)
+    
+    def _fetch_concurrently(self, fetch_one, configs, now):
+        """Run fetch_one(name, config, now) for every entry at once, dropping failures"""
+        # FRED requests are independent, so issue them all at once
+        with ThreadPoolExecutor(max_workers=len(configs)) as executor:
+            futures = {name: executor.submit(fetch_one, name, config, now) for name, config in configs.items()}
+        results = {name: future.result() for name, future in futures.items()}
+        return {name: data for name, data in results.items() if data is not None}
+    
+    def _fetch_one_indicator(self, name, config, now):
+        try:
+            series = _fred_series(config["series"])
+            if name == "GDP":
+                latest_val = config["transform"](series).iloc[-1] / 1e3  # Convert millions to billions
+                formatted_val = config["format"].format(latest_val)
+                value = latest_val
+            else:
+                value = config["transform"](series)
+                formatted_val = config["format"].format(value)
+            return {
+                "value": value,
+                "formatted": formatted_val,
+                "history": series.iloc[-24:],
+                "updated": now
+            }
+        except Exception as e:
+            logger.warning("Error fetching %s: %s", name, e)
+            return None
     
-    def fetch_central_bank_rates(self):
+    def fetch_central_bank_rates(self, now):
         rates = {
             "Federal Reserve": {"series": "FEDFUNDS", "color": "#2e59d9"},
             "ECB": {"series": "ECBESTRVOLWGTTRMDMNRT", "color": "#4e73df"},
             "BOE": {"series": "IUDSOIA", "color": "#e74a3b"},
             "BOJ": {"series": "IRSTCI01JPM156N", "color": "#1cc88a"}
         }
-        results = {}
-        for name, config in rates.items():
-            try:
-                series = fred.get_series(config["series"])
-                current = series.iloc[-1]
-                prev = series.iloc[-2] if len(series) > 1 else current
-                change = current - prev
-                results[name] = {
-                    "rate": current,
-                    "change": change,
-                    "history": series.tail(36),
-                    "color": config["color"],
-                    "updated": datetime.datetime.now(TIME_ZONE)
-                }
-            except Exception as e:
-                st.error(f"Error fetching {name} rates: {str(e)}")
-        return results
+        return self._fetch_concurrently(self._fetch_one_rate, rates, now)
     
-    def fetch_commodities(self):
-        commodities = {
-            "Crude Oil (WTI)": {"ticker": "CL=F", "unit": "$/bbl"},
-            "Brent Crude": {"ticker": "BZ=F", "unit": "$/bbl"},
-            "Gold": {"ticker": "GC=F", "unit": "$/oz"},
-            "Silver": {"ticker": "SI=F", "unit": "$/oz"},
-            "Copper": {"ticker": "HG=F", "unit": "$/lb"},
-            "Natural Gas": {"ticker": "NG=F", "unit": "$/mmBtu"},
-            "Wheat": {"ticker": "ZW=F", "unit": "$/bushel"}
-        }
-        results = []
-        for name, config in commodities.items():
-            try:
-                ticker = yf.Ticker(config["ticker"])
-                hist = ticker.history(period="2d", interval="1d")
-                if not hist.empty:
-                    current = hist["Close"].iloc[-1]
-                    prev_close = hist["Close"].iloc[0]
-                    change_pct = (current - prev_close) / prev_close * 100
-                    results.append({
-                        "Commodity": name,
-                        "Price": current,
-                        "Unit": config["unit"],
-                        "Change %": change_pct,
-                        "Updated": datetime.datetime.now(TIME_ZONE)
-                    })
-            except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
-        return results
+    def _fetch_one_rate(self, name, config, now):
+        try:
+            series = _fred_series(config["series"])
+            current = series.iloc[-1]
+            prev = series.iloc[-2] if len(series) > 1 else current
+            change = current - prev
+            return {
+                "rate": current,
+                "change": change,
+                "history": series.iloc[-36:],
+                "color": config["color"],
+                "updated": now
+            }
+        except Exception as e:
+            logger.warning("Error fetching %s rates: %s", name, e)
+            return None
     
-    def fetch_risk_sentiment(self):
-        now = datetime.datetime.now(TIME_ZONE)
+    def fetch_commodities(self, now):
+        tickers = [config["ticker"] for config in COMMODITIES.values()]
+        try:
+            hist = _fetch_quotes(tickers)
+            closes = hist.xs("Close", level=1, axis=1).reindex(columns=tickers)
+        except Exception as e:
+            logger.warning("Error fetching commodities: %s", e)
+            return None
+        # Whole-column arithmetic: last and first valid close for every ticker at once
+        current = closes.ffill().iloc[-1].to_numpy()
+        prev_close = closes.bfill().iloc[0].to_numpy()
+        data = pd.DataFrame({
+            "Commodity": list(COMMODITIES),
+            "Price": current,
+            "Unit": [config["unit"] for config in COMMODITIES.values()],
+            "Change %": (current - prev_close) / prev_close * 100,
+            "Updated": now
+        })
+        for name in data.loc[data["Price"].isna(), "Commodity"]:
+            logger.warning("No commodity data returned for %s", name)
+        return data.dropna(subset=["Price"]).reset_index(drop=True)
+    
+    def fetch_risk_sentiment(self, now):
         try:
-            vix = yf.Ticker("^VIX").history(period="1d").iloc[0]["Close"]
+            # One month of closes covers both the latest level and the chart
+            vix_history = yf.Ticker("^VIX").history(period="1mo")["Close"]
+            vix = vix_history.iloc[-1]
         except Exception as e:
-            st.error(f"Error fetching VIX: {str(e)}")
+            logger.warning("Error fetching VIX: %s", e)
             vix = 20  # Default value
+            vix_history = pd.Series(dtype=float)
         return {
             "VIX": {
                 "value": vix,
                 "level": "High" if vix > 30 else "Elevated" if vix > 20 else "Normal",
-                "history": yf.Ticker("^VIX").history(period="1mo")["Close"],
+                "history": vix_history,
                 "updated": now
             },
             "GPR": {
-                "value": np.random.normal(50, 10),
+                "value": GPR_VALUE,
                 "level": "Elevated",
-                "history": pd.Series(np.random.normal(50, 5, 30)),
+                "history": GPR_HISTORY,
                 "updated": now
             },
             "Sentiment": {
-                "value": np.random.uniform(0, 100),
+                "value": SENTIMENT_VALUE,
                 "level": "Neutral",
                 "updated": now
             }
         }
     
-    def fetch_news(self):
-        now = datetime.datetime.now(TIME_ZONE)
+    def fetch_news(self, now):
         return [
             {
                 "headline": "Fed Holds Rates Steady, Signals Potential Cuts Later This Year",
@@ -244,39 +316,77 @@ class DataManager:
         ]
     
     def update_all_data(self):
+        # One timestamp per cycle, shared by every record
+        now = datetime.datetime.now(TIME_ZONE)
+        sections = {
+            "market": lambda: self.fetch_market_data(now),
+            "intraday": self.fetch_intraday,
+            "economic": lambda: self.fetch_economic_indicators(now),
+            "rates": lambda: self.fetch_central_bank_rates(now),
+            "commodities": lambda: self.fetch_commodities(now),
+            "risk": lambda: self.fetch_risk_sentiment(now),
+            "news": lambda: self.fetch_news(now)
+        }
         try:
-            new_data = {
-                "market": self.fetch_market_data(),
-                "economic": self.fetch_economic_indicators(),
-                "rates": self.fetch_central_bank_rates(),
-                "commodities": self.fetch_commodities(),
-                "risk": self.fetch_risk_sentiment(),
-                "news": self.fetch_news()
-            }
+            # Sections hit independent endpoints, so fetch them side by side
+            with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+                futures = {key: executor.submit(fetch) for key, fetch in sections.items()}
+            new_data = {key: future.result() for key, future in futures.items()}
             with self.data_lock:
                 self.cache = new_data
-                self.last_updated = datetime.datetime.now(TIME_ZONE)
+                self.last_updated = now
         except Exception as e:
-            st.error(f"Data update failed: {str(e)}")
+            logger.error("Data update failed: %s", e)
+    
+    def next_refresh_delay(self, now):
+        """Seconds until the next scheduled refresh, based on US market hours"""
+        # Never sleep past the next tier boundary, so a faster cadence starts on time
+        seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        to_boundary = min(b * 60 for b in SESSION_BOUNDARIES if b * 60 > seconds) - seconds
+        return min(self._tier_interval(now), to_boundary)
+    
+    def _tier_interval(self, now):
+        """Refresh interval for the trading session now falls in"""
+        if now.weekday() >= 5:
+            return OFF_HOURS_INTERVAL
+        
+        minutes = now.hour * 60 + now.minute
+        if 9 * 60 + 30 <= minutes < 16 * 60:
+            return REFRESH_INTERVAL
+        if 4 * 60 <= minutes < 20 * 60:
+            return EXTENDED_HOURS_INTERVAL
+        return OFF_HOURS_INTERVAL
+    
+    def get_snapshot(self):
+        """The cache and its timestamp, both from the same refresh"""
+        with self.data_lock:
+            return self.cache, self.last_updated
     
     def start(self):
         def update_loop():
             while not self.stop_event.is_set():
                 self.update_all_data()
-                time.sleep(REFRESH_INTERVAL)
+                # Wake early on a manual refresh or stop; repeated clicks coalesce
+                self.refresh_event.wait(self.next_refresh_delay(datetime.datetime.now(TIME_ZONE)))
+                self.refresh_event.clear()
         self.thread = threading.Thread(target=update_loop, daemon=True)
         self.thread.start()
     
     def stop(self):
         self.stop_event.set()
+        self.refresh_event.set()
         self.thread.join()
 
-if 'data_manager' not in st.session_state:
+@st.cache_resource
+def get_data_manager():
     data_manager = DataManager()
     data_manager.start()
-    st.session_state.data_manager = data_manager
-else:
-    data_manager = st.session_state.data_manager
+    atexit.register(data_manager.stop)
+    return data_manager
+
+data_manager = get_data_manager()
+# Read once so every section outside the fragment renders the same refresh
+snapshot, _ = data_manager.get_snapshot()
 
 with st.sidebar:
     st.image("https://via.placeholder.com/150x50?text=Macro+Pro", width=150)
@@ -292,18 +402,17 @@ with st.sidebar:
         default=["North America", "Europe", "Asia"]
     )
     st.markdown("---")
-    st.markdown(f"**Last Updated:** <span class='blink'>{data_manager.last_updated.strftime('%Y-%m-%d %H:%M:%S')}</span>", 
-                unsafe_allow_html=True)
     if st.button("🔄 Manual Refresh"):
-        data_manager.update_all_data()
-        st.rerun()
+        # Serviced by the update thread so the page doesn't block on the fetch
+        data_manager.refresh_event.set()
+        st.caption("Refresh requested, new data will appear on the next rerun.")
     st.markdown("---")
     st.markdown("### About")
     st.markdown("""
     **Global Macro Pro Dashboard**  
     Professional-grade macroeconomic monitoring tool  
     Version 2.1.0  
-    Data updates every 60 seconds  
+    Data updates every 60 seconds during US market hours  
     """)
 
 st.markdown(f"""
@@ -317,27 +426,36 @@ st.markdown(f"""
 
 # ===== MARKET OVERVIEW =====
 st.markdown('<div class="section-header">📈 Market Overview</div>', unsafe_allow_html=True)
-if data_manager.cache["market"]:
-    market_data = data_manager.cache["market"]
-    cols = st.columns(4)
-    for i, index in enumerate(market_data[:4]):
-        with cols[i]:
-            change_class = "positive" if index["Change %"] >= 0 else "negative"
-            change_arrow = "▲" if index["Change %"] >= 0 else "▼"
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">{index['Index']}</div>
-                <div class="metric-value">{index['Price']:,.2f}</div>
-                <div class="metric-change {change_class}">
-                    {change_arrow} {abs(index['Change %']):.2f}%
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def _market_overview():
+    """Market cards and tables; reruns on its own every refresh interval"""
+    # One locked read so the timestamp, cards and tabs show the same refresh
+    cache, updated = data_manager.get_snapshot()
+    st.markdown(f"**Last Updated:** <span class='blink'>{updated.strftime('%Y-%m-%d %H:%M:%S')}</span>", 
+                unsafe_allow_html=True)
+    market_data = cache["market"]
+    if market_data is None or market_data.empty:
+        return
+    
+    # Top indices as one flex row: a single markdown call instead of four
+    cards = []
+    for index in market_data.head(4).to_dict("records"):
+        change_class = "positive" if index["Change %"] >= 0 else "negative"
+        change_arrow = "▲" if index["Change %"] >= 0 else "▼"
+        cards.append(METRIC_CARD.substitute(
+            title=index["Index"],
+            value=f"{index['Price']:,.2f}",
+            change_class=change_class,
+            change=f"{change_arrow} {abs(index['Change %']):.2f}%"
+        ))
+    st.markdown(f'<div class="card-row">{"".join(cards)}</div>', unsafe_allow_html=True)
     tab1, tab2 = st.tabs(["Charts", "Performance Table"])
     with tab1:
+        # Drawn from bars the update thread already fetched
         fig = go.Figure()
-        if market_data[0]["Intraday"] is not None:
-            intraday = market_data[0]["Intraday"]
+        intraday = cache["intraday"]
+        if intraday is not None and not intraday.empty:
             fig.add_trace(go.Scatter(
                 x=intraday.index,
                 y=intraday["Close"],
@@ -353,64 +471,28 @@ if data_manager.cache["market"]:
         )
         st.plotly_chart(fig, use_container_width=True)
     with tab2:
-        df_market = pd.DataFrame(market_data)
-        df_market = df_market[["Index", "Price", "Change", "Change %", "Updated"]]
-        if 'Updated' in df_market.columns:
-            df_market['Updated'] = df_market['Updated'].astype(str)
-        if AGGRID_AVAILABLE:
-            try:
-                gb = GridOptionsBuilder.from_dataframe(df_market)
-                gb.configure_default_column(
-                    filterable=True,
-                    sortable=True,
-                    resizable=True,
-                    editable=False,
-                    wrapText=True,
-                    autoHeight=True
-                )
-                gridOptions = gb.build()
-                AgGrid(
-                    df_market,
-                    gridOptions=gridOptions,
-                    height=400,
-                    theme='streamlit',
-                    fit_columns_on_grid_load=True,
-                    allow_unsafe_jscode=True
-                )
-            except Exception as e:
-                st.error(f"Error displaying AgGrid table: {str(e)}")
-                st.dataframe(df_market.style.format({
-                    "Price": "{:,.2f}",
-                    "Change": "{:,.2f}",
-                    "Change %": "{:,.2f}%"
-                }), height=400)
-        else:
-            st.dataframe(df_market.style.format({
-                "Price": "{:,.2f}",
-                "Change": "{:,.2f}",
-                "Change %": "{:,.2f}%"
-            }), height=400)
+        st.dataframe(
+            market_data[["Index", "Price", "Change", "Change %", "Updated"]],
+            column_config={
+                "Price": st.column_config.NumberColumn(format="%.2f"),
+                "Change": st.column_config.NumberColumn(format="%.2f"),
+                "Change %": st.column_config.NumberColumn(format="%.2f%%"),
+                "Updated": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+            },
+            hide_index=True,
+            use_container_width=True,
+            height=400
+        )
+
+_market_overview()
 
 # ===== GLOBAL INDICES NORMALIZED COMPARISON =====
 st.markdown('<div class="section-header">🌎 Global Indices – Normalized Performance</div>', unsafe_allow_html=True)
 
-indices_all = {
-    "S&P 500": "^GSPC",
-    "NASDAQ": "^IXIC",
-    "Dow 30": "^DJI",
-    "Russell 2000": "^RUT",
-    "FTSE 100": "^FTSE",
-    "DAX": "^GDAXI",
-    "CAC 40": "^FCHI",
-    "Nikkei 225": "^N225",
-    "Shanghai": "^SSEC",
-    "Hang Seng": "^HSI"
-}
-
 indices_selected = st.multiselect(
     "Select Indices",
-    options=list(indices_all.keys()),
-    default=list(indices_all.keys()),
+    options=list(MARKET_INDICES.keys()),
+    default=list(MARKET_INDICES.keys()),
     key="indices_select"
 )
 
@@ -428,9 +510,9 @@ if indices_selected:
         price_hist = {}
         missing_indices = []
         for idx in indices_selected:
-            ticker = indices_all[idx]
+            ticker = MARKET_INDICES[idx]
             try:
-                hist = yf.Ticker(ticker).history(period=hist_period, interval="1d")["Close"]
+                hist = _close_history(ticker, hist_period)
                 if hist.empty or hist.isnull().all():
                     missing_indices.append(idx)
                     continue
@@ -481,18 +563,16 @@ else:
 
 # ===== ECONOMIC INDICATORS =====
 st.markdown('<div class="section-header">📊 Economic Indicators</div>', unsafe_allow_html=True)
-if data_manager.cache["economic"]:
-    economic_data = data_manager.cache["economic"]
+if snapshot["economic"]:
+    economic_data = snapshot["economic"]
     cols = st.columns(5)
-    for i, (name, data) in enumerate(economic_data.items()):
-        with cols[i]:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-title">{name}</div>
-                <div class="metric-value">{data['formatted']}</div>
-                <div class="metric-change">Latest reading</div>
-            </div>
-            """, unsafe_allow_html=True)
+    for col, (name, data) in zip(cols, economic_data.items()):
+        col.markdown(METRIC_CARD.substitute(
+            title=name,
+            value=data["formatted"],
+            change_class="",
+            change="Latest reading"
+        ), unsafe_allow_html=True)
     fig = go.Figure()
     for name, data in economic_data.items():
         fig.add_trace(go.Scatter(
@@ -516,7 +596,7 @@ if data_manager.cache["economic"]:
 st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #6c757d; font-size: 0.8rem;">
-    <p>Global Macro Pro Dashboard v2.1 | Data updates every 60 seconds | © 2023 Macro Analytics</p>
+    <p>Global Macro Pro Dashboard v2.1 | Data updates every 60 seconds during US market hours | © 2023 Macro Analytics</p>
     <p>Disclaimer: This is a simulation for demonstration purposes. Not financial advice.</p>
 </div>
 """, unsafe_allow_html=True)
@@ -3,19 +3,30 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from fredapi import Fred
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 
 st.set_page_config(layout="wide")
 st.title("📉 Inflation vs Interest Rates (US, Eurozone, Japan)")
 
+SERIES_IDS = ["CPIAUCSL", "GS10", "CP0000EZ19M086NEST", "JPNCPIALLMINMEI", "IR3TIB01JPM156N"]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_all_series(api_key):
+    """Every SERIES_IDS entry from FRED, as a dict keyed by series id"""
+    # Download every series at once rather than one round-trip after another
+    fred = Fred(api_key=api_key)
+    with ThreadPoolExecutor(max_workers=len(SERIES_IDS)) as executor:
+        return dict(zip(SERIES_IDS, executor.map(fred.get_series, SERIES_IDS)))
+
 # User inputs API key
 fred_api_key = st.text_input("a79018b53e3085363528cf148b358708", type="password")
 
 if fred_api_key:
-    fred = Fred(api_key=fred_api_key)
+    series = fetch_all_series(fred_api_key)
 
     st.markdown("## 📊 US Data")
-    us_cpi = fred.get_series("CPIAUCSL")
-    us_rate = fred.get_series("GS10")  # 10-year treasury
+    us_cpi = series["CPIAUCSL"]
+    us_rate = series["GS10"]  # 10-year treasury
 
     df_us = pd.DataFrame({"US_CPI": us_cpi, "US_10Y": us_rate})
     df_us = df_us.dropna()
@@ -31,7 +42,7 @@ if fred_api_key:
     st.pyplot(fig_us)
 
     st.markdown("## 📊 Eurozone Data")
-    eu_cpi = fred.get_series("CP0000EZ19M086NEST")  # Eurozone HICP
+    eu_cpi = series["CP0000EZ19M086NEST"]  # Eurozone HICP
     eu_rate = yf.download("^TNX", start="2010-01-01", interval="1mo")["Adj Close"] / 10
 
     df_eu = pd.DataFrame({"EZ_CPI": eu_cpi})
@@ -49,8 +60,8 @@ if fred_api_key:
     st.pyplot(fig_eu)
 
     st.markdown("## 📊 Japan Data")
-    jp_cpi = fred.get_series("JPNCPIALLMINMEI")  # Japan CPI
-    jp_rate = fred.get_series("IR3TIB01JPM156N")  # Japan 3M Interbank Rate as proxy
+    jp_cpi = series["JPNCPIALLMINMEI"]  # Japan CPI
+    jp_rate = series["IR3TIB01JPM156N"]  # Japan 3M Interbank Rate as proxy
 
     df_jp = pd.DataFrame({
         "JP_CPI": jp_cpi,
@@ -4,6 +4,20 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 
+INDEX_TICKERS = {
+    'S&P 500': '^GSPC',
+    'NASDAQ': '^IXIC',
+    'Russell 2000': '^RUT',
+    'DAX': '^GDAXI',
+}
+
+COLOR_MAP = {
+    'S&P 500': 'blue',
+    'NASDAQ': 'green',
+    'Russell 2000': 'red',
+    'DAX': 'orange',
+}
+
 st.title('U.S. & European Market Index Comparison')
 
 with st.sidebar:
@@ -31,14 +45,9 @@ def load_data(time_period, show_sp500, show_nasdaq, show_russell, show_dax):
         start_date = end_date - timedelta(days=365)
     try:
         data = {}
-        if show_sp500:
-            data['S&P 500'] = yf.Ticker("^GSPC").history(start=start_date, end=end_date)['Close']
-        if show_nasdaq:
-            data['NASDAQ'] = yf.Ticker("^IXIC").history(start=start_date, end=end_date)['Close']
-        if show_russell:
-            data['Russell 2000'] = yf.Ticker("^RUT").history(start=start_date, end=end_date)['Close']
-        if show_dax:
-            data['DAX'] = yf.Ticker("^GDAXI").history(start=start_date, end=end_date)['Close']
+        for (name, ticker), shown in zip(INDEX_TICKERS.items(), (show_sp500, show_nasdaq, show_russell, show_dax)):
+            if shown:
+                data[name] = yf.Ticker(ticker).history(start=start_date, end=end_date)['Close']
         df = pd.DataFrame(data)
         # Reindex to business days (so lines are continuous)
         if not df.empty:
@@ -78,11 +87,8 @@ def display_tab_content(time_period, tab, show_sp500, show_nasdaq, show_russell,
     if not df.empty:
         if normalize:
             df = robust_normalize(df)
-        color_map = {}
-        if show_sp500: color_map['S&P 500'] = 'blue'
-        if show_nasdaq: color_map['NASDAQ'] = 'green'
-        if show_russell: color_map['Russell 2000'] = 'red'
-        if show_dax: color_map['DAX'] = 'orange'
+        shown = (show_sp500, show_nasdaq, show_russell, show_dax)
+        color_map = {name: COLOR_MAP[name] for name, on in zip(INDEX_TICKERS, shown) if on}
         available_indices = [col for col in color_map if col in df.columns and df[col].notna().sum() > 0]
         # Tab-level warning (for users)
         if show_dax and ('DAX' not in df.columns or df['DAX'].notna().sum() == 0):